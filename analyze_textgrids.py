@@ -6,6 +6,9 @@ Extracts and displays word and phoneme boundaries with statistics.
 import os
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parent
+TEXTGRID_DIR = BASE_DIR / "output_textgrids"
+
 def parse_textgrid(filepath):
     """
     Parse a Praat TextGrid file manually.
@@ -73,11 +76,12 @@ def analyze_single_textgrid(textgrid_path):
         word_tier = None
         phone_tier = None
         
-        for tier_name in tiers.keys():
-            if 'word' in tier_name.lower():
-                word_tier = tiers[tier_name]
-            elif 'phone' in tier_name.lower():
-                phone_tier = tiers[tier_name]
+        for tier_name, intervals in tiers.items():
+            name_lower = tier_name.lower()
+            if 'word' in name_lower:
+                word_tier = intervals
+            elif 'phone' in name_lower:
+                phone_tier = intervals
         
         # Display words
         if word_tier:
@@ -87,9 +91,14 @@ def analyze_single_textgrid(textgrid_path):
             print(f"\n{'Start':>8} {'End':>8} {'Duration':>10} {'Word'}")
             print("-" * 50)
             
-            for word in non_empty_words[:20]:  # Show first 20 words
-                duration = word['xmax'] - word['xmin']
-                print(f"{word['xmin']:8.3f} {word['xmax']:8.3f} {duration:10.3f}s   {word['text']}")
+            # Show first 20 words, emitted as a single write
+            rows = [
+                f"{word['xmin']:8.3f} {word['xmax']:8.3f} "
+                f"{word['xmax'] - word['xmin']:10.3f}s   {word['text']}"
+                for word in non_empty_words[:20]
+            ]
+            if rows:
+                print("\n".join(rows))
             
             if len(non_empty_words) > 20:
                 print(f"... ({len(non_empty_words) - 20} more words)")
@@ -102,9 +111,14 @@ def analyze_single_textgrid(textgrid_path):
             print(f"\n{'Start':>8} {'End':>8} {'Duration':>10} {'Phone'}")
             print("-" * 50)
             
-            for phone in non_empty_phones[:30]:  # Show first 30 phones
-                duration = phone['xmax'] - phone['xmin']
-                print(f"{phone['xmin']:8.3f} {phone['xmax']:8.3f} {duration:10.3f}s   {phone['text']}")
+            # Show first 30 phones, emitted as a single write
+            rows = [
+                f"{phone['xmin']:8.3f} {phone['xmax']:8.3f} "
+                f"{phone['xmax'] - phone['xmin']:10.3f}s   {phone['text']}"
+                for phone in non_empty_phones[:30]
+            ]
+            if rows:
+                print("\n".join(rows))
             
             if len(non_empty_phones) > 30:
                 print(f"... ({len(non_empty_phones) - 30} more phonemes)")
@@ -132,19 +146,18 @@ def analyze_single_textgrid(textgrid_path):
 def analyze_all_textgrids():
     """Analyze all TextGrid files in the output directory."""
     
-    base_dir = Path(__file__).parent
-    textgrid_dir = base_dir / "output_textgrids"
-    
-    if not textgrid_dir.exists():
-        print(f"❌ Directory not found: {textgrid_dir}")
+    if not TEXTGRID_DIR.exists():
+        print(f"❌ Directory not found: {TEXTGRID_DIR}")
         print("\nPlease run MFA alignment first:")
         print("  mfa align mfa_data/ english_us_arpa english_us_arpa output_textgrids/")
         return
     
-    textgrid_files = sorted(textgrid_dir.glob("*.TextGrid"))
+    textgrid_files = sorted(e.path for e in os.scandir(TEXTGRID_DIR)
+                            if e.is_file() and not e.name.startswith('.')
+                            and e.name.lower().endswith('.textgrid'))
     
     if not textgrid_files:
-        print(f"❌ No TextGrid files found in {textgrid_dir}")
+        print(f"❌ No TextGrid files found in {TEXTGRID_DIR}")
         return
     
     print("="*70)
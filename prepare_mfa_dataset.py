@@ -11,95 +11,155 @@ MFA expects:
     ...
 """
 
+import hashlib
 import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from validate_dataset import build_records, index_transcripts
+
+BASE_DIR = Path(__file__).resolve().parent
+WAV_DIR = BASE_DIR / "wav"
+TRANSCRIPT_DIR = BASE_DIR / "transcripts"
+MFA_DIR = BASE_DIR / "mfa_data"
+MANIFEST_PATH = MFA_DIR / ".manifest"
+
+_WS_RE = re.compile(r'\s+')
+
+# Bump when the .lab processing changes so cached output is rebuilt
+PREP_VERSION = 1
+
+def source_state():
+    """List the names, mtimes and sizes of the source wavs and transcripts."""
+    entries = []
+    for directory in (WAV_DIR, TRANSCRIPT_DIR):
+        for entry in os.scandir(directory):
+            stat = entry.stat()
+            entries.append((directory.name, entry.name, stat.st_mtime_ns, stat.st_size))
+    return sorted(entries)
+
+def dataset_manifest(sources):
+    """Hash the processing version, the source state and the MFA output state."""
+    outputs = []
+    if MFA_DIR.exists():
+        for entry in os.scandir(MFA_DIR):
+            if entry.name != MANIFEST_PATH.name:
+                stat = entry.stat()
+                outputs.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    state = (PREP_VERSION, sources, sorted(outputs))
+    return hashlib.blake2b(repr(state).encode()).hexdigest()
+
+def print_next_steps():
+    """Print the commands to run after preparation."""
+    print("""
+Next Steps:
+  1. Install MFA: conda install -c conda-forge montreal-forced-aligner
+  2. Download dictionary: mfa model download dictionary english_us_arpa
+  3. Download acoustic model: mfa model download acoustic english_us_arpa
+  4. Run alignment:
+     mfa align mfa_data/ english_us_arpa english_us_arpa output_textgrids/
+    """)
+
+def link_audio(src_audio, dst_audio):
+    """Hard-link an audio file into the MFA directory, copying if linking fails."""
+    # MFA only reads the wavs, so a hard link is enough and moves no bytes.
+    # Fall back to copyfile (sendfile/copy_file_range) across devices.
+    try:
+        os.link(src_audio, dst_audio)
+    except OSError:
+        shutil.copyfile(src_audio, dst_audio)
+
+def write_lab(transcript_path, dst_transcript, kind):
+    """Write a transcript as a single-line .lab file for MFA."""
+    # MFA expects .lab or .txt files with the same basename
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        transcript_content = f.read().strip()
+    
+    # Process based on file type
+    if kind == 'ISLE':
+        # ISLE files: single line, already uppercase
+        # Keep as-is for MFA
+        processed_text = transcript_content
+    else:
+        # F2BJRLP files: multi-line transcripts
+        # Combine into single line for MFA (remove extra whitespace)
+        processed_text = _WS_RE.sub(' ', transcript_content)
+    
+    # Save as .lab file (MFA standard) or .txt
+    dst_transcript.write_bytes(processed_text.encode('utf-8'))
+
 def prepare_mfa_data():
     """Prepare dataset in MFA-compatible format."""
     
-    base_dir = Path(__file__).parent
-    wav_dir = base_dir / "wav"
-    transcript_dir = base_dir / "transcripts"
-    mfa_dir = base_dir / "mfa_data"
-    
     print("=" * 60)
     print("Preparing Dataset for MFA")
     print("=" * 60)
     
+    # Skip preparation if neither the sources nor the prepared output have
+    # changed since the last successful run
+    sources = source_state()
+    if MANIFEST_PATH.exists() and MANIFEST_PATH.read_text() == dataset_manifest(sources):
+        print("\n✓ Sources unchanged since last preparation - skipping (cache hit)")
+        print(f"✓ Output directory: {MFA_DIR}")
+        print_next_steps()
+        return
+    
     # Create MFA directory
-    if mfa_dir.exists():
-        print(f"\n⚠ Directory '{mfa_dir}' already exists. Remove it? (y/n)")
+    if MFA_DIR.exists():
+        print(f"\n⚠ Directory '{MFA_DIR}' already exists. Remove it? (y/n)")
         response = input().strip().lower()
         if response == 'y':
-            shutil.rmtree(mfa_dir)
+            shutil.rmtree(MFA_DIR)
         else:
             print("Aborted.")
             return
     
-    mfa_dir.mkdir(exist_ok=True)
-    print(f"\n✓ Created directory: {mfa_dir}")
+    MFA_DIR.mkdir(exist_ok=True)
+    print(f"\n✓ Created directory: {MFA_DIR}")
     
     # Get all wav files
-    wav_files = sorted([f for f in os.listdir(wav_dir) if f.endswith('.wav')])
+    wav_files = sorted(e.name for e in os.scandir(WAV_DIR)
+                       if e.is_file() and e.name.endswith('.wav'))
     
-    processed = 0
-    for wav_file in wav_files:
-        basename = os.path.splitext(wav_file)[0]
-        
-        # Find transcript (handle both .txt and .TXT)
-        txt_path_lower = transcript_dir / f"{basename}.txt"
-        txt_path_upper = transcript_dir / f"{basename}.TXT"
-        
-        if txt_path_lower.exists():
-            transcript_path = txt_path_lower
-        elif txt_path_upper.exists():
-            transcript_path = txt_path_upper
-        else:
-            print(f"⚠ No transcript found for {wav_file}, skipping...")
-            continue
-        
-        # Copy audio file
-        src_audio = wav_dir / wav_file
-        dst_audio = mfa_dir / wav_file
-        shutil.copy2(src_audio, dst_audio)
-        
-        # Copy and process transcript
-        # MFA expects .lab or .txt files with the same basename
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_content = f.read().strip()
-        
-        # Process based on file type
-        if 'ISLE' in basename:
-            # ISLE files: single line, already uppercase
-            # Keep as-is for MFA
-            processed_text = transcript_content
-        else:
-            # F2BJRLP files: multi-line transcripts
-            # Combine into single line for MFA (remove extra whitespace)
-            processed_text = ' '.join(transcript_content.split())
-        
-        # Save as .lab file (MFA standard) or .txt
-        dst_transcript = mfa_dir / f"{basename}.lab"
-        with open(dst_transcript, 'w', encoding='utf-8') as f:
-            f.write(processed_text)
+    txt_index = index_transcripts(TRANSCRIPT_DIR)
+    
+    records = build_records(wav_files, txt_index)
+    
+    for record in records:
+        if record.transcript_path is None:
+            print(f"⚠ No transcript found for {record.wav_file}, skipping...")
+    
+    jobs = [record for record in records if record.transcript_path is not None]
+    
+    # Copying and writing are I/O-bound, so run them on a thread pool
+    max_workers = min(8, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Link (or copy) audio files
+        list(executor.map(
+            lambda job: link_audio(WAV_DIR / job.wav_file, MFA_DIR / job.wav_file),
+            jobs))
         
-        print(f"✓ Processed: {basename}")
-        processed += 1
+        # Copy and process transcripts
+        list(executor.map(
+            lambda job: write_lab(job.transcript_path,
+                                  MFA_DIR / f"{job.basename}.lab", job.kind),
+            jobs))
+    
+    for job in jobs:
+        print(f"✓ Processed: {job.basename}")
+    processed = len(jobs)
+    
+    # Record the sources and output of this run
+    MANIFEST_PATH.write_text(dataset_manifest(sources))
     
     print(f"\n" + "=" * 60)
     print(f"✓ Successfully prepared {processed} file pairs")
-    print(f"✓ Output directory: {mfa_dir}")
+    print(f"✓ Output directory: {MFA_DIR}")
     print("=" * 60)
     
-    print("""
-Next Steps:
-  1. Install MFA: conda install -c conda-forge montreal-forced-aligner
-  2. Download dictionary: mfa model download dictionary english_us_arpa
-  3. Download acoustic model: mfa model download acoustic english_us_arpa
-  4. Run alignment:
-     mfa align mfa_data/ english_us_arpa english_us_arpa output_textgrids/
-    """)
+    print_next_steps()
 
 if __name__ == "__main__":
     prepare_mfa_data()
@@ -3,11 +3,18 @@ MFA Wrapper Script
 Makes it easy to run MFA commands in the mfa_env conda environment
 """
 
+import os
 import subprocess
 import sys
 
 def run_mfa_command(args):
     """Run an MFA command in the mfa_env environment."""
+    # Alignment scales with worker count; use every core unless told otherwise
+    if (args and args[0] == "align"
+            and not any(arg in ("-h", "--help") for arg in args)
+            and not any(arg.startswith(("-j", "--num_jobs")) for arg in args)):
+        args = args + ["--num_jobs", str(os.cpu_count() or 1)]
+    
     command = ["conda", "run", "-n", "mfa_env", "mfa"] + args
     
     try:
@@ -4,58 +4,82 @@ Validates that all audio files have corresponding transcripts and checks file in
 """
 
 import os
+from collections import namedtuple
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parent
+WAV_DIR = BASE_DIR / "wav"
+TRANSCRIPT_DIR = BASE_DIR / "transcripts"
+
+Record = namedtuple('Record', ['basename', 'wav_file', 'transcript_path', 'kind'])
+
+def index_transcripts(directory):
+    """
+    Map each case-folded transcript basename to its path in a single directory
+    scan. Names are matched case-insensitively (as on Windows), and .txt is
+    preferred when several case variants exist.
+    """
+    txt_index = {}
+    for entry in os.scandir(directory):
+        stem, ext = os.path.splitext(entry.name)
+        if not entry.is_file() or ext.lower() != '.txt':
+            continue
+        key = stem.casefold()
+        if ext == '.txt' or key not in txt_index:
+            txt_index[key] = entry.path
+    return txt_index
+
+def build_records(wav_files, txt_index):
+    """
+    Pair each wav file with its transcript (None if missing) and dataset type.
+    """
+    records = []
+    for wav_file in wav_files:
+        basename = os.path.splitext(wav_file)[0]
+        kind = 'ISLE' if basename.startswith('ISLE') else 'F2BJRLP'
+        records.append(Record(basename, wav_file, txt_index.get(basename.casefold()), kind))
+    return records
+
 def validate_dataset():
     """Validate the audio-transcript pairing for MFA."""
     
-    base_dir = Path(__file__).parent
-    wav_dir = base_dir / "wav"
-    transcript_dir = base_dir / "transcripts"
-    
     print("=" * 60)
     print("MFA Dataset Validation")
     print("=" * 60)
     
     # Get all wav files
-    wav_files = sorted([f for f in os.listdir(wav_dir) if f.endswith('.wav')])
+    wav_files = sorted(e.name for e in os.scandir(WAV_DIR)
+                       if e.is_file() and e.name.endswith('.wav'))
     
     print(f"\n✓ Found {len(wav_files)} audio files in 'wav/'")
     
-    # Track validation results
-    paired_files = []
-    missing_transcripts = []
+    txt_index = index_transcripts(TRANSCRIPT_DIR)
     
-    for wav_file in wav_files:
-        basename = os.path.splitext(wav_file)[0]
-        
-        # Check for both .txt and .TXT extensions (case-sensitive on some systems)
-        txt_path_lower = transcript_dir / f"{basename}.txt"
-        txt_path_upper = transcript_dir / f"{basename}.TXT"
+    records = build_records(wav_files, txt_index)
+    missing_transcripts = [r.wav_file for r in records if r.transcript_path is None]
+    
+    paired_files = []
+    for record in records:
+        if record.transcript_path is None:
+            continue
         
-        if txt_path_lower.exists():
-            transcript_path = txt_path_lower
-            paired = True
-        elif txt_path_upper.exists():
-            transcript_path = txt_path_upper
-            paired = True
-        else:
-            paired = False
-            transcript_path = None
+        # Only the preview is shown, so read just until there is more than a
+        # preview's worth of text (or EOF); leading whitespace is dropped as we go
+        content = ''
+        with open(record.transcript_path, 'r', encoding='utf-8') as f:
+            while len(content.rstrip()) <= 50:
+                chunk = f.read(256)
+                if not chunk:
+                    break
+                content = (content + chunk).lstrip()
+        content = content.rstrip()
         
-        if paired:
-            # Read transcript to verify it's not empty
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                
-            paired_files.append({
-                'audio': wav_file,
-                'transcript': transcript_path.name,
-                'type': 'ISLE' if 'ISLE' in wav_file else 'F2BJRLP',
-                'content_preview': content[:50] + '...' if len(content) > 50 else content
-            })
-        else:
-            missing_transcripts.append(wav_file)
+        paired_files.append({
+            'audio': record.wav_file,
+            'transcript': os.path.basename(record.transcript_path),
+            'type': record.kind,
+            'content_preview': content[:50] + '...' if len(content) > 50 else content
+        })
     
     # Print results
     print(f"\n✓ Successfully paired: {len(paired_files)}/{len(wav_files)} files")